@@ -1,20 +1,18 @@
 import threading
 
 import uvicorn
-from dotenv import load_dotenv
 
-# 加载 .env 文件
-load_dotenv()
-import os
-
-# 读取配置
-HOST = os.getenv("HOST", "127.0.0.1")
-PORT = int(os.getenv("PORT", 8000))
+# 读取配置 (app.config 负责加载 .env 文件)
+from app.config import HOST, PORT
 
 
 def start_fastapi():
     # 启动IP和端口
-    uvicorn.run("app.main:app", host=HOST, port=PORT, reload=False)
+    # 请求日志由 RequestMiddleware 记录, 关闭 uvicorn 自带的访问日志;
+    # 不在反向代理后部署, 关闭代理头解析; 不额外生成 Server/Date 响应头
+    # loop/http 保持默认 "auto": 安装了 uvloop/httptools 时 uvicorn 会自动使用 (Windows 下回退为 asyncio)
+    uvicorn.run("app.main:app", host=HOST, port=PORT, reload=False,
+                access_log=False, proxy_headers=False, server_header=False, date_header=False)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+# app/config.py
+"""
+读取 .env 配置文件, 每个进程只加载一次
+- 其他模块从这里导入配置常量, 不再各自调用 load_dotenv / os.getenv
+- 通过环境变量 ENV_FILE 指定配置文件, 默认 .env.development
+"""
+import os
+
+from dotenv import load_dotenv
+
+ENV_FILE = os.getenv("ENV_FILE", ".env.development")
+load_dotenv(ENV_FILE)
+
+# 运行环境, 非 dev 时不注册文档 / README / 静态文件 / openapi.json 等开发用路由
+# 未设置时按生产环境处理, 只有明确设置 ENV="dev" 才会暴露这些路由
+ENV = os.getenv("ENV", "prod")
+DEV = ENV == "dev"
+
+HOST = os.getenv("HOST", "127.0.0.1")
+PORT = int(os.getenv("PORT", 8000))
+TITLE = os.getenv("TITLE")
+VERSION = os.getenv("VERSION")
+
+# 允许跨域访问的源 (逗号分隔), 解析一次并去除空值; 未配置时不启用 CORS
+CORS_ORIGINS = tuple(o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip())
+
+README_PATH = "README.md"
+STATIC_DIR = "app/static"
+# swagger/redoc 静态资源的访问地址, 生产环境可设置为 CDN 地址, 默认由本服务的 /static 提供
+STATIC_URL = os.getenv("STATIC_CDN", "/static").rstrip("/")
@@ -7,6 +7,10 @@
 - This module contains event handling related to it, so it will be called when the application starts and shuts down.
 """
 
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
 # 导入事件处理程序模块
 from .startup import startup
 from .shutdown import shutdown
@@ -17,18 +21,16 @@ __version__ = "1.0.0"
 __author__ = "like"
 
 __all__ = [
-    "events",
+    "lifespan",
     "startup",
     "shutdown",
     "setup_logger"
 ]
 
 
-def events(app):
-    @app.on_event("startup")
-    async def on_startup():
-        await startup()  # 在应用启动时执行
-
-    @app.on_event("shutdown")
-    async def on_shutdown():
-        await shutdown()  # 在应用结束时执行
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期, 传给 FastAPI(lifespan=...), 替代已弃用的 @app.on_event"""
+    await startup()  # 在应用启动时执行
+    yield
+    await shutdown()  # 在应用结束时执行
@@ -1,14 +1,16 @@
 # app/events/logger_config.py
 """格式化日志，本地打印"""
 
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 logger_level = logging.DEBUG
 log_path = 'logs/'
-if not os.path.exists(log_path):
-    os.makedirs(log_path)
+os.makedirs(log_path, exist_ok=True)
 
 # ANSI 转义序列
 RESET = "\033[0m"
@@ -22,47 +24,137 @@ MAGENTA = "\033[95m"  # CRITICAL
 # 创建一个自定义的格式化器
 class ColoredFormatter(logging.Formatter):
     COLORS = {
-        'DEBUG': GREEN,
-        'INFO': BLUE,
-        'WARNING': YELLOW,
-        'ERROR': RED,
-        'CRITICAL': MAGENTA,
+        logging.DEBUG: GREEN,
+        logging.INFO: BLUE,
+        logging.WARNING: YELLOW,
+        logging.ERROR: RED,
+        logging.CRITICAL: MAGENTA,
     }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 预先生成每个级别的颜色和级别名称部分, 按 levelno 查表, 避免每条日志重复拼接
+        self._levels = {
+            levelno: (color, f"[{logging.getLevelName(levelno):>8s}]{RESET}")
+            for levelno, color in self.COLORS.items()
+        }
+        # 缓存最近一秒的时间戳字符串, 同一秒内的日志不再重复调用 strftime
+        self._last_time = (None, "")
+
     def format(self, record):
-        # 获取当前日志级别的颜色
-        color = self.COLORS.get(record.levelname, RESET)
-        # 格式化时间戳和级别名称部分
-        record.asctime = self.formatTime(record, self.datefmt)
+        # 获取当前日志级别的颜色和级别名称部分
+        level = self._levels.get(record.levelno)
+        if level is None:
+            level = (RESET, f"[{record.levelname:>8s}]{RESET}")
+        color, levelname = level
+        # 格式化时间戳
+        second = int(record.created)
+        last_second, asctime = self._last_time
+        if second != last_second:
+            asctime = self.formatTime(record, self.datefmt)
+            self._last_time = (second, asctime)
+        record.asctime = asctime
         # 将整个部分变色
-        msecs = int(record.msecs)  # 转换为整数
-        formatted_message = f"{color}[{record.asctime},{msecs:03d}] [{record.levelname:>8s}]{RESET} - {record.msg}"
-        return formatted_message
+        # 使用 getMessage() 合并 %-style 参数, 参数只在日志真正输出时才格式化
+        return f"{color}[{asctime},{int(record.msecs):03d}] {levelname} - {record.getMessage()}"
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    带写缓冲的回滚文件处理器
+    - 日志先写入 64KB 用户态缓冲区, WARNING 及以上级别立即刷盘, 其余由 BufferedQueueListener 在队列清空时统一刷盘
+    - 自行累计文件字节数判断是否回滚, 父类每条日志的 seek/tell 会把缓冲区提前刷出
+    """
+    buffer_size = 64 * 1024
+    flush_level = logging.WARNING
+
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                      encoding=self.encoding, errors=self.errors)
+        self.bytes_written = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.stream.encoding, "replace"))
+            if self.maxBytes > 0 and self.bytes_written + size >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self.bytes_written += size
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class BufferedQueueListener(QueueListener):
+    """队列中的日志处理完 (一批请求写完) 后刷新处理器缓冲区, 空闲时不会有日志滞留在缓冲区"""
+
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+# 创建格式器
+formatter = ColoredFormatter('%(message)s',
+                             datefmt='%Y-%m-%d %H:%M:%S')
+
+# 创建文件处理器，文件大小达到16MB时回滚; delay=True 在第一条日志写入时才打开文件
+file_handler = BufferedRotatingFileHandler(f"{log_path}app.log", maxBytes=16 * 1024 * 1024, backupCount=10,
+                                           encoding="utf-8", delay=True)
+file_handler.setLevel(logging.INFO)
+file_handler.setFormatter(formatter)
+
+# 文件写入交给后台线程: 请求线程只把日志记录放入队列, 格式化/写文件/回滚都在监听线程中完成
+log_queue = queue.Queue(-1)
+queue_listener = BufferedQueueListener(log_queue, file_handler, respect_handler_level=True)
+queue_listener.start()
+atexit.register(queue_listener.stop)  # 进程退出时写完队列中剩余的日志 (logging 自身的 atexit 随后刷盘并关闭文件)
+
+
+# 创建控制台处理器并设置级别为DEBUG (保持同步输出, 便于本地查看)
+console_handler = logging.StreamHandler()
+console_handler.setLevel(logging.DEBUG)
+console_handler.setFormatter(formatter)
+
+# 创建队列处理器, 只入队文件处理器需要的 INFO 及以上级别
+queue_handler = QueueHandler(log_queue)
+queue_handler.setLevel(logging.INFO)
+
+
+# 已配置的记录器名称, 配合锁保证每个记录器只添加一次处理器
+_configured = set()
+_configure_lock = threading.Lock()
 
 
 def setup_logger(logger_name):
+    """所有记录器共用同一组处理器, 避免每个模块各自创建处理器重复写入同一个 app.log"""
     # 创建日志记录器
     logger = logging.getLogger(logger_name)
-    logger.setLevel(logger_level)
-
-    # 创建控制台处理器并设置级别为DEBUG
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
+    if logger_name in _configured:
+        return logger
 
-    # 创建文件处理器，文件大小达到1MB时回滚
-    file_handler = RotatingFileHandler(f"{log_path}app.log", maxBytes=1 * 1024 * 1024, backupCount=3)
-    file_handler.setLevel(logging.INFO)
+    with _configure_lock:
+        # 双重检查: 等锁期间可能已被其他线程配置
+        if logger_name in _configured:
+            return logger
 
-    # 创建格式器并添加到处理器
-    formatter = ColoredFormatter('%(message)s',
-                                 datefmt='%Y-%m-%d %H:%M:%S')
-    console_handler.setFormatter(formatter)
-    file_handler.setFormatter(formatter)
+        logger.setLevel(logger_level)
 
-    # 将处理器添加到记录器
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+        # 将处理器添加到记录器
+        logger.addHandler(console_handler)
+        logger.addHandler(queue_handler)
 
-    # 禁止日志消息向上传递给父记录器，避免重复输出
-    logger.propagate = False
+        # 禁止日志消息向上传递给父记录器，避免重复输出
+        logger.propagate = False
+        _configured.add(logger_name)
     return logger
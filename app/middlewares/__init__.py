@@ -9,15 +9,10 @@
 
 # 导入事件处理程序模块
 from .auth import AuthMiddleware
-import asyncio
-import time
-from fastapi import Request, Response
+from .request import RequestMiddleware
 from starlette.middleware.cors import CORSMiddleware
-from starlette.responses import JSONResponse
 from fastapi import FastAPI
-from app.events import setup_logger
-
-logger = setup_logger(__name__)
+from app.config import CORS_ORIGINS
 
 # 包元数据
 __version__ = "1.0.0"
@@ -26,58 +21,25 @@ __author__ = "like"
 __all__ = [
     "middlewares",
     "AuthMiddleware",
+    "RequestMiddleware",
 ]
 
+# CORS 允许的方法和请求头 (使用元组, 由 CORSMiddleware 在初始化时一次性生成预检响应头)
+CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "DELETE")
+CORS_ALLOW_HEADERS = ("Authorization", "Content-Type")
 
-def middlewares(app: FastAPI):
-    # 添加CORS中间件
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],  # 允许访问的源
-        allow_credentials=True,
-        allow_methods=["GET", "POST", "PUT", "DELETE"],
-        allow_headers=["*"],
-    )
-
-    # 自定义中间件以添加安全头部
-    @app.middleware("http")
-    async def add_security_headers(request, call_next):
-        response: Response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        return response
-
-    @app.middleware("http")
-    async def ensure_event_loop_middleware(request: Request, call_next):
-        # 中间件一：检查事件循环
-        try:
-            asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        response = await call_next(request)
-        return response
-
-    @app.middleware("http")
-    async def catch_exceptions_middleware(request: Request, call_next):
-        # 中间件二：异常处理
-        try:
-            response = await call_next(request)
-        except Exception as e:
-            return JSONResponse(content={"detail": str(e)}, status_code=500)
-        return response
 
-    @app.middleware("http")
-    async def log_requests_middleware(request: Request, call_next):
-        # 中间件三：日志记录
-        start_time = time.time()  # 请求到达时计时
-        response = await call_next(request)
-        duration = time.time() - start_time  # 计算持续时间
-        # 记录日志
-        if int(response.status_code) > 400:
-            logger.error(f"{request.url} - time: {duration:.2f} seconds")
-        else:
-            logger.info(f"{request.method} {request.url.path} - time: {duration:.2f} seconds")
-        return response
+def middlewares(app: FastAPI):
+    # 安全头部 / 异常处理 / 日志记录, 合并为一个纯 ASGI 中间件
+    app.add_middleware(RequestMiddleware)
+
+    # 添加CORS中间件 (.env 未配置 CORS_ORIGINS 时不添加, 同源请求无需处理 CORS)
+    # 最后注册 = 最外层, OPTIONS 预检请求在此直接返回, 不再经过上面的各个中间件
+    if CORS_ORIGINS:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=CORS_ORIGINS,  # 允许访问的源, 来自 .env 的 CORS_ORIGINS
+            allow_credentials="*" not in CORS_ORIGINS,  # 只有明确列出的源才允许携带凭据
+            allow_methods=CORS_ALLOW_METHODS,
+            allow_headers=CORS_ALLOW_HEADERS,  # 显式列出请求头, 避免通配符逐请求回显
+        )
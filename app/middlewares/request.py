@@ -0,0 +1,67 @@
+# fastapi-app/middlewares/request.py
+
+import logging
+import time
+
+from starlette.datastructures import URL
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.events import setup_logger
+
+logger = setup_logger(__name__)
+# 日志级别在启动后不会变化, 只判断一次是否需要记录 INFO 日志
+LOG_INFO = logger.isEnabledFor(logging.INFO)
+
+# 安全响应头, 预先编码为 ASGI 需要的字节对
+SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+]
+
+
+class RequestMiddleware:
+    """
+    纯 ASGI 中间件, 合并原来的 安全头部 / 异常处理 / 日志记录 三个 @app.middleware("http")
+    - 每个 @app.middleware("http") 都是一层 BaseHTTPMiddleware, 每个请求都要额外创建任务和队列来转发响应
+    - 这里直接包装 send, 一层完成全部工作
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter_ns()  # 请求到达时计时 (单调时钟, 纳秒精度)
+        status_code = 500
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                # 记录状态码并添加安全头部
+                response_started = True
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), *SECURITY_HEADERS]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            # 异常处理: 响应已开始发送时无法再返回 500, 交给上层处理
+            if response_started:
+                raise
+            response = JSONResponse(content={"detail": str(e)}, status_code=500)
+            await response(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter_ns() - start_time) / 1e6  # 计算持续时间 (毫秒)
+            # 记录日志 (%-style 延迟格式化, 级别被过滤时不拼接字符串)
+            if status_code > 400:
+                logger.error("%s - time: %.2f ms", URL(scope=scope), duration_ms)
+            elif LOG_INFO:
+                logger.info("%s %s - time: %.2f ms", scope["method"], scope["path"], duration_ms)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel
 from typing import List, Optional
 
@@ -15,15 +15,19 @@ class Item(BaseModel):
 # 存储数据的简单列表
 items = []
 
+# 固定返回内容, 导入时预先序列化为 JSON 字节, 避免每次请求重复序列化
+_HELLO = b'{"message":"Hello World"}'
+_DATA = b'{"message":"Hello from FastAPI","data":[1,2,3,4,5]}'
+
 
 @get_example.get("/HelloWorld", summary="this is get example")
 async def hello_world():
-    return {"message": "Hello World"}
+    return Response(content=_HELLO, media_type="application/json")
 
 
 @get_example.get("/data")
-def get_data():
-    return {"message": "Hello from FastAPI", "data": [1, 2, 3, 4, 5]}
+async def get_data():
+    return Response(content=_DATA, media_type="application/json")
 
 
 # GET 接口：获取所有项目
@@ -1,7 +1,12 @@
 # app/handlers/swagger_ui.py
 """ Swagger UI Handler 配置Swagger的静态页面 """
+import gzip
+import hashlib
 import os
-from fastapi import FastAPI, HTTPException
+from email.utils import formatdate
+from mimetypes import guess_type
+
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.openapi.docs import (
     get_redoc_html,
     get_swagger_ui_html,
@@ -9,47 +14,164 @@ from fastapi.openapi.docs import (
 )
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
-import markdown
+from markdown_it import MarkdownIt
+from starlette.datastructures import Headers
 from starlette.responses import RedirectResponse
 
+from app.config import README_PATH, STATIC_DIR, STATIC_URL
+
+# Markdown 解析器只创建一次, CommonMark 规范并启用表格
+md = MarkdownIt("commonmark").enable("table")
+
+
+def compress_variants(content: bytes, headers: dict):
+    """
+    启动时预先压缩一份 gzip 版本, 返回 ((原始内容, 响应头), (gzip 内容, 响应头) 或 None)
+    - 请求时按 Accept-Encoding 直接选择, 不再逐请求压缩
+    - gzip 版本的 ETag 加 -gzip 后缀与原始版本区分, 两个版本都带 Vary: Accept-Encoding
+    - 小于 1KB 或压缩后没有变小时不生成 gzip 版本
+    """
+    if len(content) < 1024:
+        return (content, headers), None
+    gzip_content = gzip.compress(content, compresslevel=9, mtime=0)
+    if len(gzip_content) >= len(content):
+        return (content, headers), None
+    headers = {**headers, "vary": "Accept-Encoding"}
+    gzip_headers = {**headers, "etag": headers["etag"][:-1] + '-gzip"', "content-encoding": "gzip"}
+    return (content, headers), (gzip_content, gzip_headers)
+
+
+def select_variant(variants, request_headers: Headers):
+    """客户端接受 gzip 且存在 gzip 版本时返回 gzip 版本, 否则返回原始版本"""
+    identity, gzipped = variants
+    if gzipped is not None and "gzip" in request_headers.get("accept-encoding", ""):
+        return gzipped
+    return identity
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    静态文件 (swagger/redoc 的 js/css) 只随部署更新
+    - 启动时把不超过 max_file_size 的文件读入内存并预先 gzip 压缩, 请求时不再 stat、读取磁盘或压缩; 其余文件仍由 StaticFiles 从磁盘读取
+    - preload=False 时不预读 (例如静态资源已由 CDN 提供), 全部由 StaticFiles 从磁盘读取
+    - 文档页面引用的地址带有 ?v=<内容哈希>, 只有版本匹配的请求才让浏览器长期缓存 (immutable); 其余请求缓存一小时后重新验证
+    """
+    max_file_size = 2 * 1024 * 1024
+    cache_control = "public, max-age=3600"
+    versioned_cache_control = "public, max-age=31536000, immutable"
+
+    def __init__(self, *args, preload: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 相对路径 -> (媒体类型, 版本号, compress_variants 的结果)
+        self.files = {}
+        if not preload or self.directory is None:
+            return
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                full_path = os.path.join(root, name)
+                stat_result = os.stat(full_path)
+                if stat_result.st_size > self.max_file_size:
+                    continue
+                with open(full_path, "rb") as f:
+                    content = f.read()
+                version = hashlib.md5(content, usedforsecurity=False).hexdigest()
+                headers = {
+                    "etag": f'"{version}"',
+                    "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+                }
+                media_type = guess_type(name)[0] or "text/plain"
+                self.files[os.path.relpath(full_path, self.directory)] = (
+                    media_type, version, compress_variants(content, headers)
+                )
+
+    async def get_response(self, path, scope):
+        cached = self.files.get(path)
+        if cached is None or scope["method"] not in ("GET", "HEAD"):
+            response = await super().get_response(path, scope)
+            if response.status_code in (200, 304):
+                response.headers["Cache-Control"] = self.cache_control
+            return response
+
+        media_type, version, variants = cached
+        request_headers = Headers(scope=scope)
+        content, headers = select_variant(variants, request_headers)
+        versioned = scope["query_string"] == b"v=" + version.encode()
+        headers = {**headers, "cache-control": self.versioned_cache_control if versioned else self.cache_control}
+        # 浏览器缓存的版本未变化时直接返回 304 (沿用 StaticFiles 的 If-None-Match / If-Modified-Since 判断)
+        if self.is_not_modified(Headers(headers), request_headers):
+            return Response(status_code=304, headers=headers)
+        return Response(content=content, media_type=media_type, headers=headers)
+
+
+def render_readme():
+    """读取 README.md 并转换为 HTML, 返回 compress_variants 的结果; 文件不存在时返回 None"""
+    if not os.path.exists(README_PATH):
+        return None
+
+    with open(README_PATH, "r", encoding="utf-8") as f:
+        md_content = f.read()
+
+    # 将 Markdown 转换为 HTML
+    html_content = md.render(md_content).encode("utf-8")
+    headers = {
+        "etag": f'"{hashlib.md5(html_content, usedforsecurity=False).hexdigest()}"',
+        "last-modified": formatdate(os.stat(README_PATH).st_mtime, usegmt=True),
+        "cache-control": "public, max-age=3600",
+    }
+    return compress_variants(html_content, headers)
+
 
 def swagger_ui(app: FastAPI):
-    # Mount static files
-    app.mount("/static", StaticFiles(directory="app/static"), name="static")
+    # README 在运行期间不会变化, 启动时渲染一次并缓存
+    app.state.readme = render_readme()
+
+    # Mount static files (STATIC_CDN 指向其他地址时文档页面不会请求 /static, 无需预读到内存)
+    static_files = CachedStaticFiles(directory=STATIC_DIR, preload=STATIC_URL == "/static")
+    app.mount("/static", static_files, name="static")
+
+    def static_url(name):
+        """静态资源地址; 由本服务提供且已读入内存的文件带上 ?v=<内容哈希>, 文件更新后地址随之变化"""
+        cached = static_files.files.get(name)
+        return f"{STATIC_URL}/{name}" if cached is None else f"{STATIC_URL}/{name}?v={cached[1]}"
+
+    # 文档页面只取决于启动时的配置, 启动时生成一次页面内容并缓存
+    app.state.swagger_html = get_swagger_ui_html(
+        openapi_url=app.openapi_url,
+        title=app.title + " - Swagger UI",
+        oauth2_redirect_url=app.swagger_ui_oauth2_redirect_url,
+        swagger_js_url=static_url("swagger-ui-bundle.js"),
+        swagger_css_url=static_url("swagger-ui.css"),
+    ).body
+    app.state.swagger_redirect_html = get_swagger_ui_oauth2_redirect_html().body
+    app.state.redoc_html = get_redoc_html(
+        openapi_url=app.openapi_url,
+        title=app.title + " - ReDoc",
+        redoc_js_url=static_url("redoc.standalone.js"),
+    ).body
+    doc_headers = {"Cache-Control": "public, max-age=3600"}
 
     @app.get("/docs", include_in_schema=False)
     async def custom_swagger_ui_html():
-        return get_swagger_ui_html(
-            openapi_url=app.openapi_url,
-            title=app.title + " - Swagger UI",
-            oauth2_redirect_url=app.swagger_ui_oauth2_redirect_url,
-            swagger_js_url="/static/swagger-ui-bundle.js",
-            swagger_css_url="/static/swagger-ui.css",
-        )
+        return HTMLResponse(content=app.state.swagger_html, headers=doc_headers)
 
     @app.get(app.swagger_ui_oauth2_redirect_url, include_in_schema=False)
     async def swagger_ui_redirect():
-        return get_swagger_ui_oauth2_redirect_html()
+        return HTMLResponse(content=app.state.swagger_redirect_html)
 
     @app.get("/redoc", include_in_schema=False)
     async def redoc_html():
-        return get_redoc_html(
-            openapi_url=app.openapi_url,
-            title=app.title + " - ReDoc",
-            redoc_js_url="/static/redoc.standalone.js",
-        )
+        return HTMLResponse(content=app.state.redoc_html, headers=doc_headers)
 
     @app.get("/README", include_in_schema=False, response_class=HTMLResponse)
-    async def read_readme():
-        if not os.path.exists("README.md"):
+    async def read_readme(request: Request):
+        if app.state.readme is None:
             raise HTTPException(status_code=404, detail="README.md file not found")
 
-        with open("README.md", "r", encoding="utf-8") as f:
-            md_content = f.read()
-
-        # 将 Markdown 转换为 HTML
-        html_content = markdown.markdown(md_content)
-        return HTMLResponse(content=html_content)
+        html_content, headers = select_variant(app.state.readme, request.headers)
+        # 浏览器缓存的版本未变化时直接返回 304 (与 /static 使用同一套 If-None-Match / If-Modified-Since 判断)
+        if static_files.is_not_modified(Headers(headers), request.headers):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(content=html_content, headers=headers)
     
     @app.get("/")
     async def redirect_to_docs():